@@ -2,7 +2,7 @@ import pygame
 import random
 import time
 import sys
-from collections import deque
+from collections import deque, OrderedDict
 
 # Initialisation de Pygame
 pygame.init()
@@ -26,6 +26,13 @@ TEXT_COLOR = (255, 255, 255)
 UI_BG_COLOR = (70, 70, 70)
 DFS_PATH_COLOR = (255, 100, 100)  # ✅ Couleur pour les chemins DFS
 BFS_PATH_COLOR = (100, 100, 255)  # ✅ Couleur pour le chemin BFS
+SEEN_PATH_COLOR = (120, 120, 140)  # ✅ Cases déjà vues mais hors du champ de vision
+SEEN_WALL_COLOR = (25, 25, 30)     # ✅ Murs déjà vus mais hors du champ de vision
+
+# Ligne de vue : au-delà de ce nombre de cases, la table de visibilité est
+# calculée à la demande et gardée dans un cache LRU au lieu d'être précalculée
+VISIBILITY_PRECOMPUTE_LIMIT = 2000
+VISIBILITY_CACHE_SIZE = 512
 
 # Difficultés
 DIFFICULTIES = {
@@ -116,6 +123,104 @@ class MazeGenerator:
         # ou s'il connecte 1 chemin (créerait un cul-de-sac)
         return adjacent_paths >= 1
 
+class VisibilityTable:
+    """Champs de vision (shadowcasting) de chaque case, limités à view_range.
+
+    Pour chaque case, les cases visibles sont stockées sous forme d'indices
+    dans la fenêtre (2 * view_range + 1)², ce qui donne une table compacte :
+    un déplacement ne coûte plus qu'une lecture de table au lieu d'un lancer
+    de rayons.
+    """
+
+    # Multiplicateurs (xx, xy, yx, yy) pour les 8 octants
+    OCTANTS = [
+        (1, 0, 0, -1), (0, 1, -1, 0), (0, -1, -1, 0), (-1, 0, 0, -1),
+        (-1, 0, 0, 1), (0, -1, 1, 0), (0, 1, 1, 0), (1, 0, 0, 1)
+    ]
+
+    def __init__(self, maze, view_range):
+        self.maze = maze
+        self.height = len(maze)
+        self.width = len(maze[0])
+        self.view_range = view_range
+        side = 2 * view_range + 1
+        self.side = side
+        # Décodage indice -> décalage (dy, dx)
+        self.offsets = [(i // side - view_range, i % side - view_range) for i in range(side * side)]
+        self.lazy = self.width * self.height > VISIBILITY_PRECOMPUTE_LIMIT
+        self.table = OrderedDict()
+        
+        if not self.lazy:
+            for y in range(self.height):
+                for x in range(self.width):
+                    if self.maze[y][x] == 0:
+                        self.table[(y, x)] = self._compute(x, y)
+    
+    def visible_from(self, x, y):
+        """Retourne la liste des cases (y, x) visibles depuis (x, y)"""
+        key = (y, x)
+        entry = self.table.get(key)
+        if entry is None:
+            entry = self._compute(x, y)
+            self.table[key] = entry
+            if self.lazy and len(self.table) > VISIBILITY_CACHE_SIZE:
+                self.table.popitem(last=False)
+        elif self.lazy:
+            self.table.move_to_end(key)
+        
+        offsets = self.offsets
+        return [(y + offsets[i][0], x + offsets[i][1]) for i in entry]
+    
+    def _is_wall(self, x, y):
+        return not (0 <= x < self.width and 0 <= y < self.height) or self.maze[y][x] == 1
+    
+    def _compute(self, x, y):
+        """Calcule par shadowcasting les indices des cases visibles depuis (x, y)"""
+        indices = {self.view_range * self.side + self.view_range}
+        for xx, xy, yx, yy in self.OCTANTS:
+            self._cast_light(x, y, 1, 1.0, 0.0, xx, xy, yx, yy, indices)
+        
+        data = sorted(indices)
+        return bytes(data) if self.side * self.side <= 256 else tuple(data)
+    
+    def _cast_light(self, cx, cy, row, start, end, xx, xy, yx, yy, indices):
+        if start < end:
+            return
+        
+        radius = self.view_range
+        new_start = start
+        for j in range(row, radius + 1):
+            dx, dy = -j - 1, -j
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                # Pentes des bords gauche et droit de la case courante
+                l_slope = (dx - 0.5) / (dy + 0.5)
+                r_slope = (dx + 0.5) / (dy - 0.5)
+                if start < r_slope:
+                    continue
+                elif end > l_slope:
+                    break
+                
+                ox, oy = dx * xx + dy * xy, dx * yx + dy * yy
+                mx, my = cx + ox, cy + oy
+                if 0 <= mx < self.width and 0 <= my < self.height:
+                    indices.add((oy + radius) * self.side + ox + radius)
+                
+                if blocked:
+                    if self._is_wall(mx, my):
+                        new_start = r_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif self._is_wall(mx, my) and j < radius:
+                    blocked = True
+                    self._cast_light(cx, cy, j + 1, start, l_slope, xx, xy, yx, yy, indices)
+                    new_start = r_slope
+            
+            if blocked:
+                break
+
 class MazeGame:
     def __init__(self):
         self.screen = None
@@ -134,6 +239,10 @@ class MazeGame:
         self.dfs_paths = []  # ✅ Stocke les chemins trouvés par DFS
         self.show_bfs_path = False  # ✅ Nouvelle variable pour afficher le chemin BFS
         self.bfs_path = []  # ✅ Stocke le chemin trouvé par BFS
+        self.line_of_sight = False  # ✅ Vue zoomée limitée à la ligne de vue
+        self.visibility = None  # ✅ Table de visibilité du labyrinthe courant
+        self.visible_cells = set()  # ✅ Cases visibles depuis la position actuelle
+        self.seen = set()  # ✅ Cases déjà aperçues (mémoire du brouillard)
         
     def select_difficulty(self):
         temp_screen = pygame.display.set_mode((400, 300), pygame.RESIZABLE)
@@ -227,12 +336,21 @@ class MazeGame:
         self.bfs_path = []  # ✅ Réinitialiser le chemin BFS
         
         self.view_range = config["view_range"]
+        self.visibility = VisibilityTable(self.maze, self.view_range)
+        self.seen = set()
+        self.update_visibility()
+        
         window_width = min(config["width"] * self.base_cell_size, 1200)
         window_height = min(config["height"] * self.base_cell_size, 800) + 80
         
         self.screen = pygame.display.set_mode((window_width, window_height), pygame.RESIZABLE)
         pygame.display.set_caption(f"Labyrinthe - {self.difficulty}")
     
+    def update_visibility(self):
+        """✅ Met à jour les cases visibles et la mémoire des cases vues"""
+        self.visible_cells = set(self.visibility.visible_from(self.player_pos[0], self.player_pos[1]))
+        self.seen |= self.visible_cells
+    
     def find_all_paths_dfs(self):
         """✅ Trouve tous les chemins possibles de la position actuelle à la sortie en utilisant DFS"""
         config = DIFFICULTIES[self.difficulty]
@@ -412,6 +530,14 @@ class MazeGame:
                         cell_size,
                         cell_size
                     )
+                    # ✅ En ligne de vue, les cases vues auparavant sont assombries
+                    # et les cases jamais vues ne sont pas dessinées
+                    if self.line_of_sight and (y, x) not in self.visible_cells:
+                        if (y, x) in self.seen:
+                            color = SEEN_WALL_COLOR if self.maze[y][x] == 1 else SEEN_PATH_COLOR
+                            pygame.draw.rect(self.screen, color, rect)
+                        continue
+                    
                     if self.maze[y][x] == 1:
                         pygame.draw.rect(self.screen, WALL_COLOR, rect)
                     else:
@@ -421,7 +547,7 @@ class MazeGame:
                         pygame.draw.rect(self.screen, VISITED_COLOR, rect)
             
             # ✅ Dessiner la position de départ en vert dans la vue réduite
-            if start_y <= 1 < end_y and start_x <= 1 < end_x:
+            if start_y <= 1 < end_y and start_x <= 1 < end_x and self.is_drawable(1, 1):
                 start_rect = pygame.Rect(
                     (1 - start_x) * cell_size + offset_x,
                     (1 - start_y) * cell_size + offset_y,
@@ -434,7 +560,7 @@ class MazeGame:
             if self.show_dfs_paths and self.dfs_paths:
                 for path in self.dfs_paths:
                     for y, x in path:
-                        if start_y <= y < end_y and start_x <= x < end_x:
+                        if start_y <= y < end_y and start_x <= x < end_x and self.is_visible(y, x):
                             # Ne pas redessiner la position de départ
                             if not (y == 1 and x == 1):
                                 rect = pygame.Rect(
@@ -448,7 +574,7 @@ class MazeGame:
             # ✅ Dessiner le chemin BFS dans la vue réduite
             if self.show_bfs_path and self.bfs_path:
                 for y, x in self.bfs_path:
-                    if start_y <= y < end_y and start_x <= x < end_x:
+                    if start_y <= y < end_y and start_x <= x < end_x and self.is_visible(y, x):
                         # Ne pas redessiner la position de départ
                         if not (y == 1 and x == 1):
                             rect = pygame.Rect(
@@ -467,7 +593,7 @@ class MazeGame:
             )
             pygame.draw.ellipse(self.screen, PLAYER_COLOR, player_rect)
             
-            if start_y <= height-2 <= end_y-1 and start_x <= width-1 <= end_x-1:
+            if start_y <= height-2 <= end_y-1 and start_x <= width-1 <= end_x-1 and self.is_drawable(height-2, width-1):
                 exit_rect = pygame.Rect(
                     (width-1 - start_x) * cell_size + offset_x,
                     (height-2 - start_y) * cell_size + offset_y,
@@ -478,6 +604,14 @@ class MazeGame:
         
         self.draw_ui()
     
+    def is_visible(self, y, x):
+        """✅ Indique si la case (y, x) est dans le champ de vision en mode ligne de vue"""
+        return not self.line_of_sight or (y, x) in self.visible_cells
+    
+    def is_drawable(self, y, x):
+        """✅ Indique si la case (y, x) a déjà été aperçue en mode ligne de vue"""
+        return not self.line_of_sight or (y, x) in self.seen
+    
     def draw_ui(self):
         config = DIFFICULTIES[self.difficulty]
         
@@ -508,6 +642,10 @@ class MazeGame:
         bfs_text = font.render(bfs_status, True, TEXT_COLOR)
         self.screen.blit(bfs_text, (self.screen.get_width()//2 - bfs_text.get_width()//2 + 80, self.screen.get_height() - 30))
         
+        los_status = "Ligne de vue: ON (V)" if self.line_of_sight else "Ligne de vue: OFF (V)"
+        los_text = font.render(los_status, True, TEXT_COLOR)
+        self.screen.blit(los_text, (20, self.screen.get_height() - 30))
+        
         display_mode = "Plein écran (F)" if self.fullscreen else "Fenêtré (F)"
         display_text = font.render(display_mode, True, TEXT_COLOR)
         self.screen.blit(display_text, (self.screen.get_width() - display_text.get_width() - 20, self.screen.get_height() - 30))
@@ -565,6 +703,7 @@ class MazeGame:
             self.player_pos = [new_x, new_y]
             self.moves += 1
             self.visited.add((new_y, new_x))
+            self.update_visibility()
             
             if new_x == DIFFICULTIES[self.difficulty]["width"] - 1 and new_y == DIFFICULTIES[self.difficulty]["height"] - 2:
                 self.game_over = True
@@ -600,6 +739,9 @@ class MazeGame:
                             self.bfs_path = self.find_shortest_path_bfs()
                         else:
                             self.bfs_path = []
+                    # ✅ Touche V pour activer/désactiver la ligne de vue
+                    elif event.key == pygame.K_v:
+                        self.line_of_sight = not self.line_of_sight
                 
                 if event.key == pygame.K_f:
                     self.toggle_fullscreen()